@@ -5,7 +5,7 @@ from converter_amateur_mutaties import excel_to_txt_mutaties
 
 # Cue Print -> Cue Web converter
 from converter_amateur_online import cueprint_txt_to_docx_bytes
-from converter_topscorers import extract_text_from_upload_bytes, topscorers_text_to_docx_bytes
+from converter_topscorers import topscorers_upload_to_docx_bytes
 from converter_topscorers_cumulated import cumulated_topscorers_to_docx_bytes, ConversionError
 
 import os
@@ -307,8 +307,7 @@ def convert_topscorers():
                 "Verkeerd bestand: dit lijkt geen .txt of .docx. Upload een tekstbestand (Word of Kladblok).",
             )
 
-        text_in = extract_text_from_upload_bytes(raw, file.filename or "")
-        docx_bytes = topscorers_text_to_docx_bytes(text_in)
+        docx_bytes = topscorers_upload_to_docx_bytes(raw, file.filename or "")
     except Exception as e:
         return abort(400, f"Kon topscorers-bestand niet verwerken: {e}")
 
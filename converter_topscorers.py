@@ -11,14 +11,18 @@ Doel (zoals TOPSCORERS voorbeeld.docx):
 
 from __future__ import annotations
 
+import hashlib
 import re
-import tempfile
+import threading
+from collections import OrderedDict
+from enum import IntEnum
+from functools import lru_cache
 from io import BytesIO
-from typing import List, Tuple, Optional
+from typing import Iterator, List, Tuple, Optional
 
 from docx import Document
-from docx.oxml import OxmlElement
-from docx.oxml.ns import qn
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls, qn
 
 # Legacy: sommige bronnen beginnen items met "1." (optioneel)
 NUMBER_RE = re.compile(r"^\s*\d+\.\s*")
@@ -29,43 +33,87 @@ NUMBER_RE = re.compile(r"^\s*\d+\.\s*")
 # "...-14 doelpunt"
 GOALS_RE = re.compile(r"\s*-\s*(\d+)\s+doelpunt(?:en)?\s*$", re.IGNORECASE)
 
+# Los getal ergens in de regel (fallback voor doelpunten-regels)
+INT_RE = re.compile(r"\b\d+\b")
+
 
 # ----------------------------
 # Parsing helpers
 # ----------------------------
 def looks_like_player_stat_line(line: str) -> bool:
     s = line.strip()
-    lower = s.lower()
     if "(" in s and ")" in s:
         return True
-    if GOALS_RE.search(s):
-        return True
-    if "-" in s and re.search(r"\b\d+\b", s) and "doelpunt" in lower:
-        return True
-    return False
+    # Goedkope substring-tests eerst; een GOALS_RE-match voldoet altijd ook aan
+    # deze drie voorwaarden, dus een aparte GOALS_RE.search is niet nodig.
+    if "-" not in s:
+        return False
+    return "doelpunt" in s.lower() and INT_RE.search(s) is not None
+
+
+def _is_heading_text(s: str) -> bool:
+    """Kopregel: 'klasse' of 'divisie' erin en geen spelerregel (s: gestript, zonder rangnummer)."""
+    lower = s.lower()
+    if "klasse" not in lower and "divisie" not in lower:
+        return False
+    return not looks_like_player_stat_line(s)
 
 
 def is_section_heading(line: str) -> bool:
     s = line.strip()
     if not s:
         return False
-    if NUMBER_RE.match(s):
-        return False
-    upper = s.upper()
-    if "KLASSE" not in upper and "DIVISIE" not in upper:
-        return False
-    if looks_like_player_stat_line(s):
+    if s[:1].isdigit() and NUMBER_RE.match(s):
         return False
-    return True
+    return _is_heading_text(s)
 
 
 def strip_source_rank_number(line: str) -> str:
-    return re.sub(r"^\s*\d+\.\s*", "", line, count=1)
+    # Zelfde resultaat als NUMBER_RE.sub("", line, count=1), zonder regex
+    head, sep, tail = line.lstrip().partition(".")
+    if sep and head.isdecimal():
+        return tail.lstrip()
+    return line
 
 
-def parse_sections(text: str) -> List[Tuple[str, List[List[str]]]]:
+class LineKind(IntEnum):
+    HEADING = 1
+    NUMBERED = 2  # legacy "1. ..." regel
+    CONTINUATION = 3  # spelerregel (met of zonder goals-suffix)
+
+
+def classify_line(line: str) -> Tuple[LineKind, str]:
     """
-    Parseer inputtekst naar secties (titel + groepen regels).
+    Bepaal het soort van een gestripte, niet-lege regel (uit _iter_lines).
+    Geeft (soort, tekst) terug; bij NUMBERED zonder het bron-rangnummer.
+    """
+    # Goedkope eerste-teken-check: de meeste regels beginnen met een letter
+    if line[:1].isdecimal():
+        tail = strip_source_rank_number(line)
+        if tail is not line:  # ongewijzigd terug = geen rangnummer
+            return LineKind.NUMBERED, tail
+    if _is_heading_text(line):
+        return LineKind.HEADING, line
+    return LineKind.CONTINUATION, line
+
+
+def _iter_lines(text: str) -> Iterator[str]:
+    """Geef de gestripte, niet-lege regels uit de tekst (zonder tussenlijst)."""
+    for raw in text.splitlines():
+        line = raw.strip()
+        if line:
+            yield line
+
+
+def parse_sections_flat(text: str) -> Tuple[List[str], List[int], List[Tuple[str, int, int]]]:
+    """
+    Parseer inputtekst naar platte lijsten (zonder geneste lijst per groep).
+
+    Geeft (lines, group_offsets, section_spans) terug:
+    - lines: alle itemregels achter elkaar, in bronvolgorde.
+    - group_offsets: startindex in `lines` per groep, plus afsluitend len(lines);
+      groep g = lines[group_offsets[g]:group_offsets[g + 1]].
+    - section_spans: (titel, eerste groep, einde groep) per sectie.
 
     Regels:
     - Sectiekoppen: regels met 'KLASSE' of 'DIVISIE'.
@@ -75,82 +123,113 @@ def parse_sections(text: str) -> List[Tuple[str, List[List[str]]]]:
 
     Volgorde uit de bron blijft exact behouden.
     """
-    lines = text.splitlines()
-
-    sections: List[Tuple[str, List[List[str]]]] = []
+    lines: List[str] = []
+    group_offsets: List[int] = []
+    section_spans: List[Tuple[str, int, int]] = []
     current_title: Optional[str] = None
-    current_groups: List[List[str]] = []
-    current_group: List[str] = []
+    section_start = 0  # index in group_offsets van de eerste groep in deze sectie
     current_goals: Optional[int] = None
 
-    def flush_group() -> None:
-        nonlocal current_group, current_groups
-        if current_group:
-            current_groups.append(current_group)
-            current_group = []
-
-    def flush_section() -> None:
-        nonlocal current_title, current_groups, sections, current_goals
-        if current_title and current_groups:
-            sections.append((current_title, current_groups))
-        current_groups = []
-        current_goals = None
+    for raw in _iter_lines(text or ""):
+        kind, line = classify_line(raw)
 
-    for raw in lines:
-        line = raw.strip()
-        if not line:
+        # 1) Legacy input: "1. ..." start altijd een nieuwe groep
+        if kind == LineKind.NUMBERED:
+            group_offsets.append(len(lines))
+            lines.append(line)
+            m = GOALS_RE.search(line)
+            current_goals = int(m.group(1)) if m else None
             continue
 
-        if is_section_heading(line):
-            flush_group()
-            flush_section()
+        if kind == LineKind.HEADING:
+            if current_title and len(group_offsets) > section_start:
+                section_spans.append((current_title, section_start, len(group_offsets)))
+            elif len(group_offsets) > section_start:
+                # Regels zonder (geldige) sectiekop vallen weg
+                del lines[group_offsets[section_start]:]
+                del group_offsets[section_start:]
+            section_start = len(group_offsets)
+            current_goals = None
             current_title = line
             continue
 
-        # 1) Legacy input: "1. ..." start altijd een nieuwe groep
-        if NUMBER_RE.match(line):
-            flush_group()
-            stripped = strip_source_rank_number(line)
-            current_group = [stripped]
-            m = GOALS_RE.search(stripped)
-            current_goals = int(m.group(1)) if m else None
-            continue
-
-        # 2) Huidige input: groepeer op goals-wissel
-        m = GOALS_RE.search(line)
+        # 2) Huidige input: groepeer op goals-wissel (zonder '-' geen goals-suffix)
+        m = "-" in line and GOALS_RE.search(line)
         if m:
             goals = int(m.group(1))
-            if current_goals is None:
-                # Eerste goals in deze sectie
-                flush_group()
-                current_group = [line]
+            if current_goals is None or goals != current_goals:
+                # Eerste goals in deze sectie, of nieuw aantal goals => nieuw lijstitem (Enter)
+                group_offsets.append(len(lines))
                 current_goals = goals
-            elif goals != current_goals:
-                # Nieuw aantal goals => nieuw lijstitem (Enter)
-                flush_group()
-                current_group = [line]
-                current_goals = goals
-            else:
-                # Zelfde goals, maar opnieuw suffix => zelfde groep
-                if not current_group:
-                    current_group = [line]
-                else:
-                    current_group.append(line)
-        else:
-            # Geen goals suffix: hoort bij huidige groep (Shift+Enter)
-            if not current_group:
-                current_group = [line]
-            else:
-                current_group.append(line)
-
-    flush_group()
-    flush_section()
-    return sections
+            elif len(group_offsets) == section_start:
+                # Zelfde goals, maar nog geen groep in deze sectie
+                group_offsets.append(len(lines))
+        elif len(group_offsets) == section_start:
+            # Geen goals suffix en nog geen groep: start er een
+            group_offsets.append(len(lines))
+        # Anders: hoort bij huidige groep (Shift+Enter)
+        lines.append(line)
+
+    if current_title and len(group_offsets) > section_start:
+        section_spans.append((current_title, section_start, len(group_offsets)))
+    elif len(group_offsets) > section_start:
+        del lines[group_offsets[section_start]:]
+        del group_offsets[section_start:]
+
+    group_offsets.append(len(lines))
+    return lines, group_offsets, section_spans
+
+
+def parse_sections(text: str) -> List[Tuple[str, List[List[str]]]]:
+    """
+    Parseer inputtekst naar secties (titel + groepen regels).
+
+    Zie parse_sections_flat voor de regels; dit is dezelfde uitkomst als geneste lijsten.
+    """
+    lines, group_offsets, section_spans = parse_sections_flat(text)
+    return [
+        (title, [lines[group_offsets[g] : group_offsets[g + 1]] for g in range(first, end)])
+        for title, first, end in section_spans
+    ]
 
 
 # ----------------------------
 # DOCX numbering (robuust + geforceerde herstart per sectie)
 # ----------------------------
+# Lijst-definities als XML-sjabloon: één parse_xml per element i.p.v. een
+# OxmlElement + set() per attribuut (ook voor w:numPr per paragraaf).
+_ABSTRACT_NUM_XML = (
+    "<w:abstractNum " + nsdecls("w") + ' w:abstractNumId="{abstract_id}">'
+    '<w:multiLevelType w:val="singleLevel"/>'
+    '<w:lvl w:ilvl="0">'
+    '<w:start w:val="1"/>'
+    '<w:numFmt w:val="decimal"/>'
+    '<w:lvlText w:val="%1."/>'
+    '<w:suff w:val="space"/>'
+    "{rpr}"  # alleen het nummer vet
+    '<w:pPr><w:ind w:left="720" w:hanging="360"/></w:pPr>'  # standaard-inspringing
+    "</w:lvl>"
+    "</w:abstractNum>"
+)
+_BOLD_RPR_XML = '<w:rPr><w:b w:val="1"/></w:rPr>'
+
+# Nieuwe lijst die op level 0 geforceerd bij 1 herstart (startOverride)
+_NUM_XML = (
+    "<w:num " + nsdecls("w") + ' w:numId="{num_id}">'
+    '<w:abstractNumId w:val="{abstract_id}"/>'
+    '<w:lvlOverride w:ilvl="0"><w:startOverride w:val="1"/></w:lvlOverride>'
+    "</w:num>"
+)
+
+# Koppeling van een paragraaf aan een lijst
+_NUMPR_XML = (
+    "<w:numPr " + nsdecls("w") + ">"
+    '<w:ilvl w:val="{ilvl}"/>'
+    '<w:numId w:val="{num_id}"/>'
+    "</w:numPr>"
+)
+
+
 def _ensure_abstract_decimal_numbering(doc: Document, bold_number: bool = True) -> int:
     """
     Maak een abstractNum voor een single-level decimal list met "%1."
@@ -165,107 +244,65 @@ def _ensure_abstract_decimal_numbering(doc: Document, bold_number: bool = True)
     ]
     abstract_id = (max(existing_abs) + 1) if existing_abs else 1
 
-    abstract = OxmlElement("w:abstractNum")
-    abstract.set(qn("w:abstractNumId"), str(abstract_id))
-
-    mlt = OxmlElement("w:multiLevelType")
-    mlt.set(qn("w:val"), "singleLevel")
-    abstract.append(mlt)
-
-    lvl = OxmlElement("w:lvl")
-    lvl.set(qn("w:ilvl"), "0")
-
-    start = OxmlElement("w:start")
-    start.set(qn("w:val"), "1")
-    lvl.append(start)
-
-    numfmt = OxmlElement("w:numFmt")
-    numfmt.set(qn("w:val"), "decimal")
-    lvl.append(numfmt)
-
-    lvltext = OxmlElement("w:lvlText")
-    lvltext.set(qn("w:val"), "%1.")
-    lvl.append(lvltext)
-
-    suff = OxmlElement("w:suff")
-    suff.set(qn("w:val"), "space")
-    lvl.append(suff)
-
-    # Alleen het nummer vet
-    if bold_number:
-        rpr = OxmlElement("w:rPr")
-        b = OxmlElement("w:b")
-        b.set(qn("w:val"), "1")
-        rpr.append(b)
-        lvl.append(rpr)
-
-    # standaard-inspringing
-    ppr = OxmlElement("w:pPr")
-    ind = OxmlElement("w:ind")
-    ind.set(qn("w:left"), "720")
-    ind.set(qn("w:hanging"), "360")
-    ppr.append(ind)
-    lvl.append(ppr)
-
-    abstract.append(lvl)
-    numbering.append(abstract)
+    numbering.append(
+        parse_xml(
+            _ABSTRACT_NUM_XML.format(
+                abstract_id=abstract_id,
+                rpr=_BOLD_RPR_XML if bold_number else "",
+            )
+        )
+    )
     return abstract_id
 
 
-def _new_numid_starting_at_1(doc: Document, abstract_id: int) -> int:
+class _NumberingAllocator:
     """
-    Maak een nieuw numId voor een nieuwe lijst (verwijst naar abstract_id)
-    en forceer start bij 1 via startOverride. Dit voorkomt doortellen.
+    Deelt nieuwe numId's uit voor één document. De bestaande w:num-elementen
+    worden één keer gescand; daarna telt een teller door (geen findall per sectie).
     """
-    numbering = doc.part.numbering_part.numbering_definitions._numbering
-
-    existing_num = [
-        int(n.get(qn("w:numId")))
-        for n in numbering.findall(qn("w:num"))
-        if n.get(qn("w:numId")) is not None
-    ]
-    num_id = (max(existing_num) + 1) if existing_num else 1
-
-    num = OxmlElement("w:num")
-    num.set(qn("w:numId"), str(num_id))
 
-    absref = OxmlElement("w:abstractNumId")
-    absref.set(qn("w:val"), str(abstract_id))
-    num.append(absref)
+    def __init__(self, doc: Document):
+        self._numbering = doc.part.numbering_part.numbering_definitions._numbering
+        existing_num = [
+            int(n.get(qn("w:numId")))
+            for n in self._numbering.findall(qn("w:num"))
+            if n.get(qn("w:numId")) is not None
+        ]
+        self._next_num_id = (max(existing_num) + 1) if existing_num else 1
 
-    # Forceer herstart bij 1 op level 0
-    lvl_override = OxmlElement("w:lvlOverride")
-    lvl_override.set(qn("w:ilvl"), "0")
-    start_override = OxmlElement("w:startOverride")
-    start_override.set(qn("w:val"), "1")
-    lvl_override.append(start_override)
-    num.append(lvl_override)
+    def new_numid_starting_at_1(self, abstract_id: int) -> int:
+        """
+        Maak een nieuw numId voor een nieuwe lijst (verwijst naar abstract_id)
+        en forceer start bij 1 via startOverride. Dit voorkomt doortellen.
+        """
+        num_id = self._next_num_id
+        self._next_num_id += 1
 
-    numbering.append(num)
-    return num_id
+        num = parse_xml(_NUM_XML.format(num_id=num_id, abstract_id=abstract_id))
+        self._numbering.append(num)
+        return num_id
 
 
 def _apply_numid_to_paragraph(paragraph, num_id: int, ilvl: int = 0) -> None:
-    """Koppel een paragraaf aan nummering (numId) op level ilvl."""
-    p = paragraph._p
-    ppr = p.get_or_add_pPr()
-
-    numpr = ppr.find(qn("w:numPr"))
-    if numpr is None:
-        numpr = OxmlElement("w:numPr")
-        ppr.append(numpr)
+    """
+    Koppel een (nieuwe) paragraaf aan nummering (numId) op level ilvl.
+    Nieuwe paragrafen hebben nog geen w:numPr, dus die wordt direct toegevoegd.
+    """
+    ppr = paragraph._p.get_or_add_pPr()
+    ppr.append(parse_xml(_NUMPR_XML.format(ilvl=ilvl, num_id=num_id)))
 
-    ilvl_el = numpr.find(qn("w:ilvl"))
-    if ilvl_el is None:
-        ilvl_el = OxmlElement("w:ilvl")
-        numpr.append(ilvl_el)
-    ilvl_el.set(qn("w:val"), str(ilvl))
 
-    numid_el = numpr.find(qn("w:numId"))
-    if numid_el is None:
-        numid_el = OxmlElement("w:numId")
-        numpr.append(numid_el)
-    numid_el.set(qn("w:val"), str(num_id))
+@lru_cache(maxsize=1)
+def _base_document_bytes() -> Tuple[bytes, int]:
+    """
+    Leeg document met de lijst-stijl (abstractNum) al aangemaakt.
+    Wordt één keer per proces opgebouwd; geeft (docx-bytes, abstractNumId) terug.
+    """
+    doc = Document()
+    abstract_id = _ensure_abstract_decimal_numbering(doc, bold_number=True)
+    buf = BytesIO()
+    doc.save(buf)
+    return buf.getvalue(), abstract_id
 
 
 # ----------------------------
@@ -282,37 +319,34 @@ def topscorers_text_to_docx_bytes(text: str) -> bytes:
       - group[1:] als extra regels met Shift+Enter binnen hetzelfde item
     - Nummering herstart per sectie geforceerd bij 1 (startOverride).
     """
-    doc = Document()
-    sections = parse_sections(text)
+    lines, group_offsets, section_spans = parse_sections_flat(text)
 
-    # één keer de abstract list-stijl aanmaken (nummer bold, tekst regular)
-    abstract_id = _ensure_abstract_decimal_numbering(doc, bold_number=True)
+    # Basisdocument met abstract list-stijl (nummer bold, tekst regular) uit de cache
+    base_bytes, abstract_id = _base_document_bytes()
+    doc = Document(BytesIO(base_bytes))
+    numbering = _NumberingAllocator(doc)
 
-    for title, groups in sections:
+    # Lokale bindingen voor de lus per groep (scheelt attribuut-lookups per item)
+    add_paragraph = doc.add_paragraph
+    join_lines = "\n".join
+
+    for title, first_group, end_group in section_spans:
         # Sectiekop: kapitalen + vet
-        p_title = doc.add_paragraph()
+        p_title = add_paragraph()
         r_title = p_title.add_run(title.upper())
         r_title.bold = True
 
         # ALTIJD opnieuw starten bij 1 per sectie (divisie én klasse)
-        num_id = _new_numid_starting_at_1(doc, abstract_id)
+        num_id = numbering.new_numid_starting_at_1(abstract_id)
 
         # Eén paragraaf per groep (nieuw nummer per nieuw goals-aantal)
-        for group in groups:
-            if not group:
-                continue
-
-            p = doc.add_paragraph()
+        for g in range(first_group, end_group):
+            p = add_paragraph()
             _apply_numid_to_paragraph(p, num_id, ilvl=0)
 
-            # Eerste regel (regular)
-            p.add_run(group[0])
-
-            # Extra regels (zelfde nummer) => Shift+Enter
-            for extra_line in group[1:]:
-                br = p.add_run()
-                br.add_break()  # soft line break (Shift+Enter)
-                p.add_run(extra_line)
+            # Eén run per groep (regular); python-docx zet elke "\n" om in
+            # <w:br/>, dus extra regels (zelfde nummer) => Shift+Enter
+            p.add_run(join_lines(lines[group_offsets[g] : group_offsets[g + 1]]))
 
     buf = BytesIO()
     doc.save(buf)
@@ -322,39 +356,88 @@ def topscorers_text_to_docx_bytes(text: str) -> bytes:
 # ----------------------------
 # Input lezen (txt/docx upload)
 # ----------------------------
+# Paragrafen op body-niveau plus die direct in tabelcellen, in documentvolgorde.
+# Tekstvakken (w:txbxContent, dubbel opgeslagen onder mc:Choice/mc:Fallback)
+# en geneste tabellen vallen hier bewust buiten, net als bij doc.paragraphs/cell.text.
+_BODY_PARAGRAPHS_XPATH = "./w:p | ./w:tbl/w:tr/w:tc/w:p"
+
+
+def extract_text_from_docx_bytes(raw: bytes) -> str:
+    """
+    Lees een .docx en geef de niet-lege regels terug (één per regel).
+    Eén doorloop over de paragrafen in documentvolgorde (ook die in tabellen).
+    """
+    body = Document(BytesIO(raw)).element.body
+    # CT_P.text: zelfde tekst als python-docx Paragraph.text (tab, regeleinde,
+    # vaste afbreekstreepje), maar zonder Paragraph-objecten.
+    return "\n".join(
+        line for p in body.xpath(_BODY_PARAGRAPHS_XPATH) for line in _iter_lines(p.text)
+    )
+
+
 def extract_text_from_upload(raw: bytes, filename: str) -> str:
     """Lees upload (.txt of .docx) en geef de tekstinhoud terug."""
     name = (filename or "").lower()
     if name.endswith(".docx"):
-        with tempfile.NamedTemporaryFile(suffix=".docx", delete=True) as tmp:
-            tmp.write(raw)
-            tmp.flush()
-            doc = Document(tmp.name)
-
-            lines: List[str] = []
-            for p in doc.paragraphs:
-                t = p.text.strip()
-                if t:
-                    lines.append(t)
-
-            for table in doc.tables:
-                for row in table.rows:
-                    for cell in row.cells:
-                        for ln in cell.text.splitlines():
-                            t = ln.strip()
-                            if t:
-                                lines.append(t)
-
-            return "\n".join(lines)
+        return extract_text_from_docx_bytes(raw)
 
     return raw.decode("utf-8", errors="replace")
 
 
+class _ContentCache:
+    """
+    Kleine LRU-cache in het werkgeheugen (alleen in dit proces, niets op schijf),
+    met een BLAKE2b-hash van de upload als sleutel.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self._maxsize = maxsize
+        self._data: "OrderedDict[bytes, object]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: bytes):
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def put(self, key: bytes, value) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self._maxsize:
+                self._data.popitem(last=False)
+
+
+def _content_key(raw: bytes) -> bytes:
+    return hashlib.blake2b(raw, digest_size=16).digest()
+
+
+# Complete conversies (docx-bytes): opnieuw converteren van hetzelfde bestand doet niets opnieuw.
+_result_cache = _ContentCache(32)
+
+
 def extract_text_from_upload_bytes(raw: bytes, filename: str) -> str:
     """Compat API voor app.py."""
     return extract_text_from_upload(raw, filename)
 
 
+def topscorers_upload_to_docx_bytes(raw: bytes, filename: str) -> bytes:
+    """
+    Upload (.txt/.docx) -> docx-bytes.
+    Resultaat wordt gecachet op inhoud (BLAKE2b-hash + type upload).
+    """
+    is_docx = (filename or "").lower().endswith(".docx")
+    key = _content_key(raw) + (b"|docx" if is_docx else b"|txt")
+
+    data = _result_cache.get(key)
+    if data is None:
+        data = topscorers_text_to_docx_bytes(extract_text_from_upload(raw, filename))
+        _result_cache.put(key, data)
+    return data
+
+
 def topscorers_text_to_cueweb_html(text: str) -> str:
     raise ImportError(
         "topscorers_text_to_cueweb_html is verwijderd. Gebruik topscorers_text_to_docx_bytes."
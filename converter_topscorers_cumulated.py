@@ -9,6 +9,7 @@ Input:
 
 Regels:
 - Spelers matchen op naam (case-insensitive).
+- Alleen Limburgse clubs tellen mee (clubnaam case-insensitive).
 - Bij match: spelling/naam uit bronbestand blijft leidend in de output.
 - Nieuwe spelers (niet in bron): spelling uit Excel wordt gebruikt.
 - Outputopmaak is exact gelijk aan converter_topscorers.topscorers_text_to_docx_bytes
@@ -25,6 +26,7 @@ import io
 import re
 from collections import defaultdict
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Dict, Tuple, Optional, List, Any
 
 import openpyxl
@@ -34,9 +36,7 @@ try:
 except Exception:  # pragma: no cover
     xlrd = None  # type: ignore
 
-from docx import Document
-
-from converter_topscorers import topscorers_text_to_docx_bytes
+from converter_topscorers import extract_text_from_docx_bytes, topscorers_text_to_docx_bytes
 
 
 # ----------------------------
@@ -232,10 +232,21 @@ LIMBURG_CLUBS = {
     'Zwentibold'
 }
 
+# Casefolded variant voor de clubfilter (hoofdletter-/spatie-verschillen uit Excel).
+_LIMBURG_CLUBS_CF = frozenset(c.casefold() for c in LIMBURG_CLUBS)
+
 
 # ----------------------------
 # Helpers: tekst uit uploads
 # ----------------------------
+_RTF_HEADER_RE = re.compile(r"^\{\\rtf1.*?\n", re.DOTALL)
+_RTF_UNICODE_RE = re.compile(r"\\u-?\d+\??")
+_RTF_CTRL_RE = re.compile(r"\\[a-zA-Z]+\d* ?")
+_WS_RE = re.compile(r"[ \t]+")
+_NL3_RE = re.compile(r"\n{3,}")
+_NONPRINT_RE = re.compile(r"[^\x09\x0A\x0D\x20-\x7E\u00A0-\u02FF\u1E00-\u1EFF]")
+
+
 def _decode_text_best_effort(raw: bytes) -> str:
     for enc in ("utf-8-sig", "utf-8", "cp1252"):
         try:
@@ -250,16 +261,16 @@ def _strip_rtf(text: str) -> str:
     # Verwijdert control words en groepen; houdt leesbare tekst over.
     text = text.replace("\r\n", "\n").replace("\r", "\n")
     # Verwijder rtf-headers
-    text = re.sub(r"^\{\\rtf1.*?\n", "", text, flags=re.DOTALL)
+    text = _RTF_HEADER_RE.sub("", text)
     # Verwijder unicode escapes \uNNNN?
-    text = re.sub(r"\\u-?\d+\??", "", text)
+    text = _RTF_UNICODE_RE.sub("", text)
     # Verwijder control words \wordN
-    text = re.sub(r"\\[a-zA-Z]+\d* ?", "", text)
+    text = _RTF_CTRL_RE.sub("", text)
     # Verwijder overige braces
     text = text.replace("{", "").replace("}", "")
     # Normaliseer whitespace
-    text = re.sub(r"[ \t]+", " ", text)
-    text = re.sub(r"\n{3,}", "\n\n", text)
+    text = _WS_RE.sub(" ", text)
+    text = _NL3_RE.sub("\n\n", text)
     return text.strip()
 
 
@@ -293,14 +304,14 @@ def _extract_text_from_doc_heuristic(raw: bytes) -> str:
     for c in candidates:
         # haal extreem veel nulls/rommel weg
         c = c.replace("\x00", "")
-        c = re.sub(r"[^\x09\x0A\x0D\x20-\x7E\u00A0-\u02FF\u1E00-\u1EFF]", "", c)
+        c = _NONPRINT_RE.sub("", c)
         c = c.replace("\r\n", "\n").replace("\r", "\n")
         sc = score(c)
         if sc > best_score:
             best = c
             best_score = sc
 
-    best = re.sub(r"\n{3,}", "\n\n", best).strip()
+    best = _NL3_RE.sub("\n\n", best).strip()
     if not best or best_score < 5:
         raise ConversionError(
             "TS-CUM-003",
@@ -312,20 +323,9 @@ def _extract_text_from_doc_heuristic(raw: bytes) -> str:
 def extract_text_from_source_upload(raw: bytes, filename: str) -> str:
     name = (filename or "").lower()
     if name.endswith(".docx"):
-        doc = Document(io.BytesIO(raw))
-        lines: List[str] = []
-        for p in doc.paragraphs:
-            t = p.text.strip()
-            if t:
-                lines.append(t)
-        for table in doc.tables:
-            for row in table.rows:
-                for cell in row.cells:
-                    for ln in cell.text.splitlines():
-                        t = ln.strip()
-                        if t:
-                            lines.append(t)
-        return "\n".join(lines)
+        # Gedeelde lezer met de topscorers-tool: regels in documentvolgorde (tabellen
+        # op hun plek, niet achteraan) en samengevoegde cellen maar één keer.
+        return extract_text_from_docx_bytes(raw)
 
     if name.endswith(".doc"):
         return _extract_text_from_doc_heuristic(raw)
@@ -343,22 +343,26 @@ LINE_PATTERN = re.compile(
 )
 
 
+_GROUP_PREFIXES: Tuple[Tuple[str, str], ...] = (
+    ("eerste klasse", "Eerste klasse"),
+    ("tweede klasse", "Tweede klasse"),
+    ("derde klasse", "Derde klasse"),
+    ("vierde klasse", "Vierde klasse"),
+    ("vijfde klasse", "Vijfde klasse"),
+)
+
+
+@lru_cache(maxsize=64)
 def canonical_group(header: str) -> str:
+    # Gecachet: er zijn maar een handvol verschillende koppen per bestand.
     h = header.strip()
     hl = h.lower()
 
     if "derde en vierde divisie" in hl:
         return "Derde en vierde divisie"
-    if hl.startswith("eerste klasse"):
-        return "Eerste klasse"
-    if hl.startswith("tweede klasse"):
-        return "Tweede klasse"
-    if hl.startswith("derde klasse"):
-        return "Derde klasse"
-    if hl.startswith("vierde klasse"):
-        return "Vierde klasse"
-    if hl.startswith("vijfde klasse"):
-        return "Vijfde klasse"
+    for prefix, canonical in _GROUP_PREFIXES:
+        if hl.startswith(prefix):
+            return canonical
     return h
 
 
@@ -387,8 +391,40 @@ def split_name_club_bron(raw_name_club: str) -> Tuple[str, Optional[str], Option
     return name, club, extra
 
 
-def _norm_name(name: str) -> str:
-    return re.sub(r"\s+", " ", (name or "").strip()).casefold()
+@lru_cache(maxsize=4096)
+def _norm_name(name: Optional[str]) -> str:
+    # Gecachet: dezelfde speler-/clubnamen komen bij parsen en mergen vaak terug.
+    return " ".join((name or "").split()).casefold()
+
+
+def _split_totals_line(line: str) -> Optional[Tuple[str, Optional[str]]]:
+    """
+    Splits een bronregel "N. Naam (club, extra) - G doelpunten" in (naam+club, G).
+    Snelle weg met str-methodes; LINE_PATTERN alleen als vangnet voor afwijkende regels.
+    """
+    head, sep, rest = line.partition(".")
+    if sep and head.isdecimal():
+        rest = rest.lstrip()
+    else:
+        rest = line
+
+    i = rest.rfind("-")
+    if i == -1:
+        return rest, None
+
+    parts = rest[i + 1 :].split()
+    if (
+        len(parts) == 2
+        and parts[0].isdecimal()
+        and parts[1].isascii()
+        and parts[1].lower() in ("doelpunt", "doelpunten")
+    ):
+        return rest[:i], parts[0]
+
+    m = LINE_PATTERN.match(line)
+    if not m:
+        return None
+    return m.group(2), m.group(3)
 
 
 def parse_totals_text(text: str) -> Tuple[Dict[Tuple[str, Optional[str]], int], Dict[Tuple[str, Optional[str]], Dict[str, Any]]]:
@@ -407,11 +443,11 @@ def parse_totals_text(text: str) -> Tuple[Dict[Tuple[str, Optional[str]], int],
             last_goals_in_block = None
             continue
 
-        m = LINE_PATTERN.match(line)
-        if not m:
+        split = _split_totals_line(line)
+        if split is None:
             continue
 
-        _, raw_name_club, goals_str = m.groups()
+        raw_name_club, goals_str = split
         name, club, extra = split_name_club_bron(raw_name_club)
 
         if goals_str is not None:
@@ -432,6 +468,11 @@ def parse_totals_text(text: str) -> Tuple[Dict[Tuple[str, Optional[str]], int],
 # ----------------------------
 SUSPICIOUS_NAMES = set()
 
+_GOALS_RE = re.compile(r"([^,\.]+?)\s+(\d+-\d+)")
+_SCORE_EN_RE = re.compile(r"\d+-\d+\s+en")
+_ALPHA_RE = re.compile(r"[^\W\d_]")
+_LEAD_PAREN_RE = re.compile(r"^(?:\([^)]*\)\s*)+")
+
 
 def normalize_division_name(division):
     if not isinstance(division, str):
@@ -447,8 +488,19 @@ def parse_goals_cell(text, home_team, away_team):
     if not text:
         return []
 
-    pattern = re.compile(r"([^,\.]+?)\s+(\d+-\d+)")
-    matches = list(pattern.finditer(text))
+    matches = list(_GOALS_RE.finditer(text))
+
+    # Eén keer lowercasen en daarna slicen. Alleen als de lengte gelijk blijft
+    # (bijv. niet bij "İ"), anders kloppen de match-offsets niet meer.
+    text_lc = text.lower()
+    same_offsets = len(text_lc) == len(text)
+
+    # Teamnamen één keer lowercasen; check op "thuis + uit in naam" is case-insensitive.
+    check_teams = (
+        isinstance(home_team, str) and isinstance(away_team, str) and bool(home_team) and bool(away_team)
+    )
+    home_lc = home_team.lower() if check_teams else ""
+    away_lc = away_team.lower() if check_teams else ""
 
     results = []
     last_player_name = None
@@ -459,8 +511,12 @@ def parse_goals_cell(text, home_team, away_team):
         raw_name = match.group(1).strip()
         score = match.group(2)
 
-        context = text[last_end : match.end(2)].lower()
-        segment = text[match.start(1) : match.end(2)].lower()
+        if same_offsets:
+            context = text_lc[last_end : match.end(2)]
+            segment = text_lc[match.start(1) : match.end(2)]
+        else:
+            context = text[last_end : match.end(2)].lower()
+            segment = text[match.start(1) : match.end(2)].lower()
         last_end = match.end(2)
 
         if (
@@ -476,18 +532,20 @@ def parse_goals_cell(text, home_team, away_team):
                 SUSPICIOUS_NAMES.add(f"bad-score-eo:{score}")
             continue
 
-        if isinstance(home_team, str) and isinstance(away_team, str):
-            if home_team and away_team and home_team in raw_name and away_team in raw_name:
+        if check_teams:
+            raw_lc = raw_name.lower()
+            if home_lc in raw_lc and away_lc in raw_lc:
                 continue
 
         name = raw_name
 
-        while name.startswith("(") and ")" in name:
-            name = name[name.find(")") + 1 :].strip()
+        # Haal voorafgaande "(...)"-toevoegingen weg.
+        if name.startswith("("):
+            name = _LEAD_PAREN_RE.sub("", name, count=1).strip()
 
         lower_name = name.lower()
 
-        if lower_name == "en" or re.fullmatch(r"\d+-\d+\s+en", lower_name):
+        if lower_name == "en" or _SCORE_EN_RE.fullmatch(lower_name):
             if last_player_name is None:
                 SUSPICIOUS_NAMES.add(f"en-without-previous:{name}")
                 continue
@@ -497,7 +555,7 @@ def parse_goals_cell(text, home_team, away_team):
                 name = name[3:].strip()
             last_player_name = name
 
-        if not any(c.isalpha() for c in name) or len(name) <= 1:
+        if len(name) <= 1 or not _ALPHA_RE.search(name):
             SUSPICIOUS_NAMES.add(name)
 
         try:
@@ -535,8 +593,7 @@ def parse_goals_cell(text, home_team, away_team):
             continue
 
         club = home_team if scored_side == "home" else away_team
-        for _ in range(steps):
-            results.append((name, club))
+        results.extend([(name, club)] * steps)
 
         prev_home, prev_away = home_goals, away_goals
 
@@ -551,42 +608,48 @@ def _is_beker_marker(val: Any) -> bool:
 
 
 def build_rankings(ws):
-    max_row = ws.max_row
+    # Eén bulk-read van de kolommen A..L als tuples (geen Cell-object per cel).
+    # Index = kolom - 1: B=1, D=3, F=5, L=11.
+    rows = list(ws.iter_rows(min_row=1, max_col=12, values_only=True))
+    # De beker-sectie wordt niet meegenomen in de competitiestanden: zoek de
+    # eerste beker-rij één keer op en behandel die als einde van het blad.
+    max_row = next((r for r, values in enumerate(rows) if _is_beker_marker(values[1])), len(rows))
     rankings = {}
 
     header_rows = []
-    for r in range(1, max_row + 1):
-        # Stop met zoeken naar divisie-tabellen zodra de beker-sectie start.
-        if _is_beker_marker(ws.cell(r, 2).value):
-            break
-        if (
-            isinstance(ws.cell(r, 2).value, str)
-            and ws.cell(r, 2).value
-            and ws.cell(r, 6).value == "EINDSTAND"
-        ):
+    for r in range(max_row):
+        values = rows[r]
+        col_b = values[1]
+        if isinstance(col_b, str) and col_b and values[5] == "EINDSTAND":
             header_rows.append(r)
 
     for header in header_rows:
-        raw_division = str(ws.cell(header, 2).value).strip()
+        raw_division = str(rows[header][1]).strip()
         division = normalize_division_name(raw_division)
         players = rankings.setdefault(division, defaultdict(int))
 
         row = header + 1
-        while row <= max_row:
-            # Stop bij de beker-sectie (wordt niet meegenomen in de competitiestanden).
-            if _is_beker_marker(ws.cell(row, 2).value):
-                break
-            home = ws.cell(row, 2).value
-            away = ws.cell(row, 4).value
+        while row < max_row:
+            values = rows[row]
+            home = values[1]
+            away = values[3]
 
             if not home and not away:
                 break
 
-            scorers = ws.cell(row, 12).value
-            if scorers:
-                for name, club in parse_goals_cell(str(scorers), str(home), str(away)):
-                    players[(name, club)] += 1
             row += 1
+            scorers = values[11]
+            if not scorers:
+                continue
+            # Tekstcellen zijn al str; alleen andere waarden (getallen, None) omzetten.
+            if not isinstance(scorers, str):
+                scorers = str(scorers)
+            if not isinstance(home, str):
+                home = str(home)
+            if not isinstance(away, str):
+                away = str(away)
+            for name, club in parse_goals_cell(scorers, home, away):
+                players[(name, club)] += 1
 
         rankings[division] = players
 
@@ -594,26 +657,22 @@ def build_rankings(ws):
 
 
 class _XlsSheetAdapter:
-    """Adapter zodat de notebook-logica ook met xlrd (.xls) werkt (1-indexed cell access)."""
+    """Adapter zodat de notebook-logica ook met xlrd (.xls) werkt (openpyxl-achtige iter_rows)."""
 
     def __init__(self, sheet):
         self._sheet = sheet
         self.max_row = int(getattr(sheet, "nrows", 0))
 
-    class _Cell:
-        def __init__(self, value):
-            self.value = value
-
-    def cell(self, r: int, c: int):
-        rr = r - 1
-        cc = c - 1
-        try:
-            val = self._sheet.cell_value(rr, cc)
-        except Exception:
-            val = None
-        if val == "":
-            val = None
-        return self._Cell(val)
+    def iter_rows(self, min_row: int = 1, max_col: int = 12, values_only: bool = True):
+        # Alleen de vorm die build_rankings gebruikt: waarden, kolom A..max_col, lege cel -> None.
+        for rr in range(min_row - 1, self.max_row):
+            try:
+                vals = self._sheet.row_values(rr, 0, max_col)
+            except Exception:
+                vals = []
+            row = [None if v == "" else v for v in vals]
+            row.extend([None] * (max_col - len(row)))
+            yield tuple(row)
 
 
 def parse_excel_round(excel_raw: bytes, excel_filename: str) -> Tuple[Dict[Tuple[str, Optional[str]], int], Dict[Tuple[str, Optional[str]], str]]:
@@ -640,18 +699,18 @@ def parse_excel_round(excel_raw: bytes, excel_filename: str) -> Tuple[Dict[Tuple
 
     rankings = build_rankings(ws)
 
-    goals_this_round: Dict[Tuple[str, Optional[str]], int] = {}
+    goals_this_round: Dict[Tuple[str, Optional[str]], int] = defaultdict(int)
     groups_for_new: Dict[Tuple[str, Optional[str]], str] = {}
 
     for division, players_dict in rankings.items():
         group = canonical_group(str(division))
         for (pname, pclub), goals in players_dict.items():
-            if not pclub or pclub not in LIMBURG_CLUBS:
+            sclub = str(pclub).strip() if pclub else ""
+            if not sclub or sclub.casefold() not in _LIMBURG_CLUBS_CF:
                 continue
-            key = (str(pname).strip(), str(pclub).strip())
-            goals_this_round[key] = goals_this_round.get(key, 0) + int(goals)
-            if key not in groups_for_new:
-                groups_for_new[key] = group
+            key = (str(pname).strip(), sclub)
+            goals_this_round[key] += int(goals)
+            groups_for_new.setdefault(key, group)
 
     return goals_this_round, groups_for_new
 
@@ -681,13 +740,10 @@ def merge_totals_case_insensitive(
         k: v for k, v in meta_before.items() if _norm_name(k[0]) != "onbekend"
     }
 
-    def _norm_club(club: Optional[str]) -> str:
-        return _norm_name(club or "")
-
     # Index bron op (genormaliseerde naam, genormaliseerde club)
     idx_before: Dict[Tuple[str, str], Tuple[str, Optional[str]]] = {}
     for key in totals_before.keys():
-        nk = (_norm_name(key[0]), _norm_club(key[1]))
+        nk = (_norm_name(key[0]), _norm_name(key[1]))
         if nk in idx_before:
             # Zelfde speler (na normalisatie) komt dubbel voor binnen dezelfde club
             raise ConversionError(
@@ -708,16 +764,16 @@ def merge_totals_case_insensitive(
         }
 
     # Groepen-index (voor fallback bij case-insensitive clubnaam)
-    idx_groups: Dict[Tuple[str, str], str] = {}
-    for (n, c), g in groups_for_new.items():
-        idx_groups[(_norm_name(n), _norm_club(c))] = g
+    idx_groups: Dict[Tuple[str, str], str] = {
+        (_norm_name(n), _norm_name(c)): g for (n, c), g in groups_for_new.items()
+    }
 
     # Voeg ronde toe
     for (name_round, club_round), extra_goals in goals_this_round.items():
         if _norm_name(name_round) == "onbekend":
             continue
 
-        nk = (_norm_name(name_round), _norm_club(club_round))
+        nk = (_norm_name(name_round), _norm_name(club_round))
 
         target_key = idx_before.get(nk)
         if target_key: